@@ -42,7 +42,7 @@ class PricePackageSerializerNoTotalField(serializers.ModelSerializer):
 
     class Meta:
         model = PricePackage
-        exclude = ('id',)
+        exclude = ('id', 'from_place', 'to_place')
 
 
 class PricePackageSerializer(PricePackageSerializerNoTotalField):
@@ -69,7 +69,7 @@ class PricePackageRouteSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = PricePackage
-        exclude = ('id', 'logistic')
+        exclude = ('id', 'logistic', 'from_place', 'to_place')
 
 
 class PackageSerializer(serializers.ModelSerializer):
@@ -9,6 +9,7 @@ from transport.api.base.serializers import SearchSerializer
 from utils.base.exceptions import QueryParseError
 from utils.base.general import tup_to_dict
 from utils.base.mixins import ListMixinUtils
+from utils.base.pagination import KeysetPagination
 from utils.base.schema import MessageSchema
 
 from . import serializers
@@ -110,6 +111,8 @@ class OrdersLogistic(generics.ListAPIView):
     """
     permission_classes = (AuthUserIsLogistic,)
     serializer_class = serializers.OrderSerializer
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-created',)
 
     def get_queryset(self):
         """
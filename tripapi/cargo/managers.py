@@ -2,9 +2,10 @@ from django.contrib.postgres.search import (SearchQuery, SearchRank,
                                             SearchVector)
 from django.db import models
 from django.db.models import Q
+from utils.base.mixins import ResolvedLocationQuerySet, get_location_model
 
 
-class PricePackageQuery(models.QuerySet):
+class PricePackageQuery(ResolvedLocationQuerySet):
     def find_logistic(self, pickup, delivery):
         """Use details in package to find the best
         and available Price Packages for the job"""
@@ -18,10 +19,18 @@ class PricePackageQuery(models.QuerySet):
         from_ranking = SearchRank(from_vector, from_query)
         to_ranking = SearchRank(to_vector, to_query)
 
+        # Match on resolved locations, ranking thresholds are only
+        # used for packages or searches the registry does not know
+        locations = get_location_model().objects
+        route = locations.get_match_q(
+            'from_place', pickup, Q(from_rank__gte=0.001)) & \
+            locations.get_match_q(
+                'to_place', delivery, Q(to_rank__gte=0.001))
+
         selected = self.select_related('logistic')\
             .annotate(from_rank=from_ranking)\
             .annotate(to_rank=to_ranking)\
-            .filter(Q(from_rank__gte=0.001) & Q(to_rank__gte=0.001))\
+            .filter(route)\
             .order_by('-from_rank', '-to_rank')
 
         return selected
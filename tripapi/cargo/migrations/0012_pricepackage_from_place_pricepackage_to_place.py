@@ -0,0 +1,25 @@
+# Generated by Django 4.0 on 2026-10-17 06:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+        ('cargo', '0011_logistic_logistics_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pricepackage',
+            name='from_place',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.location'),
+        ),
+        migrations.AddField(
+            model_name='pricepackage',
+            name='to_place',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.location'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.0 on 2026-10-17 06:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cargo', '0012_pricepackage_from_place_pricepackage_to_place'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['created', 'id'], name='cargo_order_keyset'),
+        ),
+    ]
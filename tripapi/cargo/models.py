@@ -9,6 +9,7 @@ from django.utils import timezone
 from django.utils.text import slugify
 from utils.base.fields import TrackingCodeField
 from utils.base.logger import err_logger, logger  # noqa
+from utils.base.mixins import ResolvedLocationMixin
 from utils.base.logistics.image import driver_id_path, driver_licence_path, logistics_unique_filename
 from utils.base.validators import (validate_phone, validate_rating_level,
                                    validate_special_char)
@@ -68,7 +69,7 @@ class Driver(models.Model):
         return self.user.profile.fullname
 
 
-class PricePackage(models.Model):
+class PricePackage(ResolvedLocationMixin):
     """This is also known as Route Plan
 
     :param models: _description_
@@ -80,6 +81,19 @@ class PricePackage(models.Model):
         help_text='Location where goods will shipped from', max_length=255)
     to_location = models.CharField(
         help_text='Location where goods will shipped to', max_length=255)
+    # Registry locations from_location and to_location resolve to
+    from_place = models.ForeignKey(
+        'locations.Location', on_delete=models.SET_NULL, null=True,
+        blank=True, editable=False, related_name='+')
+    to_place = models.ForeignKey(
+        'locations.Location', on_delete=models.SET_NULL, null=True,
+        blank=True, editable=False, related_name='+')
+
+    location_fields = {
+        'from_location': 'from_place',
+        'to_location': 'to_place',
+    }
+
     price = models.FloatField(
         help_text='Price per 0.5kg for the goods to be shipped')
 
@@ -174,6 +188,13 @@ class Order(models.Model):
     driver = models.ForeignKey(
         Driver, on_delete=models.SET_NULL, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of orders
+            models.Index(
+                fields=['created', 'id'], name='cargo_order_keyset'),
+        ]
+
     @property
     def readable_status(self):
         return self.get_status_display()
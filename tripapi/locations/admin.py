@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from .models import Location, LocationAlias
+
+
+class LocationAliasInline(admin.TabularInline):
+    model = LocationAlias
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'kind', 'parent', 'latitude', 'longitude',)
+    list_filter = ('kind',)
+    search_fields = ('name', 'aliases__name',)
+    inlines = (LocationAliasInline,)
@@ -0,0 +1,42 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from locations.models import Location
+
+
+class Command(BaseCommand):
+    help = 'Load states, LGAs and parks into the location registry from \
+a json file of nested locations, e.g [{"name": "Lagos", "kind": "state", \
+"latitude": 6.52, "longitude": 3.37, "aliases": ["Lagos State"], \
+"children": [...]}]'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path of the json file')
+
+    def load(self, nodes: list, parent: Location = None) -> int:
+        """Create or update locations of nodes and their children"""
+        count = 0
+        for node in nodes:
+            location, _ = Location.objects.update_or_create(
+                parent=parent, name=node['name'], kind=node['kind'],
+                defaults={
+                    'latitude': node.get('latitude'),
+                    'longitude': node.get('longitude'),
+                })
+            for alias in node.get('aliases', []):
+                location.add_alias(alias)
+            count += 1 + self.load(node.get('children', []), location)
+        return count
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path']) as file:
+                nodes = json.load(file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read locations: {e}')
+
+        with transaction.atomic():
+            count = self.load(nodes)
+
+        self.stdout.write(self.style.SUCCESS(f"Loaded {count} locations"))
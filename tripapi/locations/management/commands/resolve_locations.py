@@ -0,0 +1,51 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from locations.models import Location
+from utils.base.mixins import ResolvedLocationMixin
+
+
+class Command(BaseCommand):
+    help = 'Resolve the free text locations of trips, trip plans and \
+price packages to the location registry again, run after loading locations'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Amount of rows resolved per batch')
+
+    def resolve_model(self, model, batch_size: int) -> int:
+        """Resolve the locations of every row of model in batches"""
+        fields = model.location_fields
+        location_fields = list(fields.values())
+        queryset = model.objects.order_by('pk')
+        count, last_pk = 0, 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+
+            resolved = Location.objects.resolve_many(
+                getattr(obj, field) for obj in batch for field in fields)
+            for obj in batch:
+                for field, location_field in fields.items():
+                    setattr(
+                        obj, f'{location_field}_id',
+                        resolved[getattr(obj, field)])
+            model.objects.bulk_update(batch, location_fields)
+            count += len(batch)
+        return count
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be greater than 0')
+
+        for model in apps.get_models():
+            if not issubclass(model, ResolvedLocationMixin):
+                continue
+            count = self.resolve_model(model, batch_size)
+            self.stdout.write(
+                f"Resolved {count} {model._meta.verbose_name_plural}")
+
+        self.stdout.write(self.style.SUCCESS("Done"))
@@ -0,0 +1,185 @@
+import math
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional
+
+from django.db.models import (Exists, FloatField, Manager, Q, QuerySet,
+                              Value)
+from django.db.models.functions import ACos, Cos, Least, Radians, Sin
+
+# Mean radius of the earth in km
+EARTH_RADIUS_KM = 6371.0
+
+# Length of one degree of latitude in km
+KM_PER_DEGREE = 111.0
+
+# Depth of location kinds, deeper kinds are more specific
+LOCATION_LEVELS = {
+    'state': 0,
+    'lga': 1,
+    'park': 2,
+}
+
+
+def normalize_location_name(name: str) -> str:
+    return ' '.join(str(name).lower().split())
+
+
+def split_location_text(text: str) -> List[str]:
+    """
+    Names to look up for a free text location, e.g `Lagos, Ojota`
+    gives `lagos`, `ojota` and the whole text `lagos ojota`
+    """
+    text = str(text or '')
+    names = [normalize_location_name(part) for part in text.split(',')]
+    names.append(normalize_location_name(text.replace(',', ' ')))
+    return list(dict.fromkeys(name for name in names if name))
+
+
+class LocationQuerySet(QuerySet):
+    @property
+    def alias_model(self):
+        return self.model._meta.get_field('aliases').related_model
+
+    def within(self, locations) -> QuerySet:
+        """
+        Locations in or under `locations`, a queryset
+        or list of location ids
+        """
+        return self.model.objects.filter(
+            Q(pk__in=locations) | Q(parent__in=locations) |
+            Q(parent__parent__in=locations))
+
+    def near(
+        self, latitude: float, longitude: float, radius_km: float
+    ) -> QuerySet:
+        """
+        Locations with a centroid within radius_km of a point,
+        annotated with their `distance` in km
+        """
+        lat_delta = radius_km / KM_PER_DEGREE
+        lng_delta = radius_km / (
+            KM_PER_DEGREE * max(math.cos(math.radians(latitude)), 0.01))
+        return self\
+            .filter(
+                latitude__range=(latitude - lat_delta, latitude + lat_delta),
+                longitude__range=(
+                    longitude - lng_delta, longitude + lng_delta))\
+            .annotate(distance=EARTH_RADIUS_KM * ACos(Least(
+                Cos(Radians(Value(latitude, FloatField()))) *
+                Cos(Radians('latitude')) *
+                Cos(Radians('longitude') -
+                    Radians(Value(longitude, FloatField()))) +
+                Sin(Radians(Value(latitude, FloatField()))) *
+                Sin(Radians('latitude')),
+                Value(1.0, FloatField()))))\
+            .filter(distance__lte=radius_km)
+
+    def resolve_many(self, texts: Iterable[str]) -> Dict[str, Optional[int]]:
+        """
+        Resolve free text locations to location ids in one query.
+
+        Every comma separated part of a text is matched against
+        aliases, a text resolves to the most specific location that is
+        in or under a match of every matched part, e.g `Lagos, Ojota`
+        resolves to Ojota park in Lagos and not to another Ojota.
+        Texts without a valid match resolve to None
+        """
+        text_names = {text: split_location_text(text) for text in texts}
+        names = set()
+        for value in text_names.values():
+            names.update(value)
+
+        rows = self.alias_model.objects.filter(name__in=names).values_list(
+            'name', 'location_id', 'location__kind',
+            'location__parent_id', 'location__parent__parent_id')
+
+        matches = defaultdict(set)
+        levels, lineages = {}, {}
+        for name, pk, kind, parent_id, grandparent_id in rows:
+            matches[name].add(pk)
+            levels[pk] = LOCATION_LEVELS[kind]
+            lineages[pk] = {pk, parent_id, grandparent_id} - {None}
+
+        resolved = {}
+        for text, names in text_names.items():
+            groups = [matches[name] for name in names if name in matches]
+            candidates = set().union(*groups)
+            valid = [
+                pk for pk in candidates
+                if all(lineages[pk] & group for group in groups)]
+            resolved[text] = max(
+                valid, key=lambda pk: (levels[pk], -pk)) if valid else None
+        return resolved
+
+    def resolve(self, text: str) -> Optional[int]:
+        """Resolve a free text location to a location id"""
+        return self.resolve_many([text])[text]
+
+    def get_match_q(
+        self, field: str, text: str, fallback: Q, radius_km: float = None
+    ) -> Q:
+        """
+        Filter for rows whose location `field` matches a searched free
+        text location with the same rules as `resolve_many`, without
+        resolving the text in a separate query.
+
+        Rows without a resolved location, or searches where no part of
+        the text is a known location, use the `fallback` filter
+
+        :param field: name of the location foreign key on searched model
+        :type field: str
+        :param text: searched free text location
+        :type text: str
+        :param fallback: filter for unresolved rows or texts
+        :type fallback: Q
+        :param radius_km: when passed, match locations within radius_km
+        of the resolved location centroid instead, defaults to None
+        :type radius_km: float, optional
+        :rtype: Q
+        """
+        unresolved = Q(**{f'{field}__isnull': True})
+
+        if radius_km is not None:
+            location = self.filter(
+                pk=self.resolve(text), latitude__isnull=False,
+                longitude__isnull=False).first()
+            if location is None:
+                return fallback
+            nearby = self.near(
+                location.latitude, location.longitude, radius_km)
+            return Q(**{f'{field}__in': nearby.values('pk')}) | \
+                (unresolved & fallback)
+
+        names = split_location_text(text)
+        aliases = self.alias_model.objects
+        known = Exists(aliases.filter(name__in=names))
+
+        matched = ~unresolved
+        for name in names:
+            part = aliases.filter(name=name)
+            matched &= ~Q(Exists(part)) | Q(**{
+                f'{field}__in': self.within(part.values('location'))})
+
+        return (Q(known) & matched) | ((~Q(known) | unresolved) & fallback)
+
+
+class LocationManager(Manager):
+    def get_queryset(self):
+        return LocationQuerySet(self.model, using=self._db)
+
+    def within(self, locations) -> QuerySet:
+        return self.get_queryset().within(locations)
+
+    def near(
+        self, latitude: float, longitude: float, radius_km: float
+    ) -> QuerySet:
+        return self.get_queryset().near(latitude, longitude, radius_km)
+
+    def resolve_many(self, texts: Iterable[str]) -> Dict[str, Optional[int]]:
+        return self.get_queryset().resolve_many(texts)
+
+    def resolve(self, text: str) -> Optional[int]:
+        return self.get_queryset().resolve(text)
+
+    def get_match_q(self, *args, **kwargs) -> Q:
+        return self.get_queryset().get_match_q(*args, **kwargs)
@@ -0,0 +1,48 @@
+# Generated by Django 4.0 on 2026-10-17 06:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('kind', models.CharField(choices=[('state', 'State'), ('lga', 'Local government area'), ('park', 'Park')], max_length=10)),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('parent', models.ForeignKey(blank=True, help_text='State of an LGA or LGA of a park', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='children', to='locations.location')),
+            ],
+            options={
+                'ordering': ('kind', 'name'),
+            },
+        ),
+        migrations.CreateModel(
+            name='LocationAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(db_index=True, max_length=255)),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='locations.location')),
+            ],
+            options={
+                'verbose_name_plural': 'Location aliases',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='locationalias',
+            constraint=models.UniqueConstraint(fields=('location', 'name'), name='unique_location_alias'),
+        ),
+        migrations.AddIndex(
+            model_name='location',
+            index=models.Index(fields=['latitude', 'longitude'], name='locations_centroid'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+from django.db import models
+
+from .managers import LocationManager, normalize_location_name
+
+
+class Location(models.Model):
+    """
+    Registry of states, LGAs and parks, free text locations of trips
+    and price packages are resolved to these on write so searches
+    can match location ids instead of ranking text
+    """
+
+    LOCATION_KINDS = (
+        ('state', 'State',),
+        ('lga', 'Local government area',),
+        ('park', 'Park',),
+    )
+
+    name = models.CharField(max_length=255)
+    kind = models.CharField(choices=LOCATION_KINDS, max_length=10)
+    parent = models.ForeignKey(
+        'self', on_delete=models.CASCADE, null=True, blank=True,
+        related_name='children',
+        help_text='State of an LGA or LGA of a park')
+
+    # Centroid used for radius searches
+    latitude = models.FloatField(null=True, blank=True)
+    longitude = models.FloatField(null=True, blank=True)
+
+    objects: LocationManager = LocationManager()
+
+    class Meta:
+        ordering = ('kind', 'name',)
+        indexes = [
+            models.Index(
+                fields=['latitude', 'longitude'],
+                name='locations_centroid'),
+        ]
+
+    def add_alias(self, name: str) -> 'LocationAlias':
+        alias, _ = self.aliases.get_or_create(
+            name=normalize_location_name(name))
+        return alias
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.add_alias(self.name)
+
+    def __str__(self):
+        if self.parent_id:
+            return f"{self.name}, {self.parent}"
+        return self.name
+
+
+class LocationAlias(models.Model):
+    """
+    Normalized name a location can be written as
+    e.g `ojota`, `ojota motor park`
+    """
+
+    location = models.ForeignKey(
+        Location, on_delete=models.CASCADE, related_name='aliases')
+    name = models.CharField(max_length=255, db_index=True)
+
+    class Meta:
+        verbose_name_plural = 'Location aliases'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['location', 'name'], name='unique_location_alias'),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.name = normalize_location_name(self.name)
+        return super().save(*args, **kwargs)
+
+    def __str__(self):
+        return self.name
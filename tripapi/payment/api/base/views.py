@@ -17,6 +17,7 @@ from rest_framework.views import APIView
 from utils.base.flutterwave import payment_client
 from utils.base.logger import err_logger, logger  # noqa
 from utils.base.mixins import ListMixinUtils, UpdateRetrieveViewSet
+from utils.base.pagination import KeysetPagination
 
 from utils.base.general import url_with_params
 
@@ -172,6 +173,8 @@ class PaymentViewSet(ListMixinUtils, viewsets.ReadOnlyModelViewSet):
     serializer_class = serializers.PaymentSerializer
     permission_classes = (AuthUserIsPartner,)
     lookup_field = 'tracking_code'
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-created',)
 
     def get_queryset(self):
         return Transaction.objects.filter(
@@ -6,6 +6,7 @@ import pytest
 from rest_framework.test import APIClient
 
 from account.models import User
+from locations.models import Location
 from project_api_key.models import ProjectApiKey
 from transport.models import Transporter
 from utils.base.general import get_tokens_for_user
@@ -243,3 +244,35 @@ def dummy_request():
 @pytest.fixture(autouse=True)
 def use_dummy_media_path(settings, tmp_path):
     settings.MEDIA_ROOT = settings.BASE_DIR / tmp_path
+
+
+@pytest.fixture
+def locations():
+    """Small location registry, keyed by name"""
+    lagos = Location.objects.create(
+        name='Lagos', kind='state', latitude=6.5244, longitude=3.3792)
+    kosofe = Location.objects.create(
+        name='Kosofe', kind='lga', parent=lagos,
+        latitude=6.5914, longitude=3.4049)
+    ojota = Location.objects.create(
+        name='Ojota', kind='park', parent=kosofe,
+        latitude=6.5870, longitude=3.3792)
+    ojota.add_alias('Ojota motor park')
+    ikeja = Location.objects.create(
+        name='Ikeja', kind='lga', parent=lagos,
+        latitude=6.6018, longitude=3.3515)
+    oyo = Location.objects.create(
+        name='Oyo', kind='state', latitude=7.8500, longitude=3.9300)
+    ibadan = Location.objects.create(
+        name='Ibadan North', kind='lga', parent=oyo,
+        latitude=7.3964, longitude=3.9167)
+    ibadan.add_alias('Ibadan')
+    ogun = Location.objects.create(
+        name='Ogun', kind='state', latitude=6.9980, longitude=3.4737)
+    ogun_ojota = Location.objects.create(
+        name='Ojota', kind='park', parent=ogun)
+    return {
+        'lagos': lagos, 'kosofe': kosofe, 'ojota': ojota, 'ikeja': ikeja,
+        'oyo': oyo, 'ibadan': ibadan, 'ogun': ogun,
+        'ogun_ojota': ogun_ojota,
+    }
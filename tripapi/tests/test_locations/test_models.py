@@ -0,0 +1,103 @@
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from cargo.models import PricePackage
+from locations.models import Location, LocationAlias
+from model_bakery import baker
+
+pytestmark = pytest.mark.django_db
+
+
+class TestLocation():
+    def test_name_alias(self, locations):
+        assert LocationAlias.objects.filter(
+            location=locations['ikeja'], name='ikeja').exists()
+        assert locations['ojota'].aliases.count() == 2
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("Lagos", 'lagos'),
+            ("lagos,  OJOTA", 'ojota'),
+            ("Ogun, Ojota", 'ogun_ojota'),
+            ("Ojota motor park", 'ojota'),
+            ("Oyo, Ibadan", 'ibadan'),
+            ("Ibadan", 'ibadan'),
+            ("Lagos, Ibadan", None),
+            ("Kano", None),
+            ("", None),
+        ]
+    )
+    def test_resolve(self, locations, text, expected):
+        location_id = Location.objects.resolve(text)
+        if expected is None:
+            assert location_id is None
+        else:
+            assert location_id == locations[expected].pk
+
+    def test_resolve_many_queries(
+        self, locations, django_assert_num_queries
+    ):
+        with django_assert_num_queries(1):
+            resolved = Location.objects.resolve_many(
+                ["Lagos, Ojota", "Ikeja", "Kano"])
+        assert resolved == {
+            "Lagos, Ojota": locations['ojota'].pk,
+            "Ikeja": locations['ikeja'].pk,
+            "Kano": None,
+        }
+
+    def test_within(self, locations):
+        within = set(Location.objects.within(
+            [locations['lagos'].pk]).values_list('name', flat=True))
+        assert within == {'Lagos', 'Kosofe', 'Ojota', 'Ikeja'}
+
+    def test_near(self, locations):
+        ojota = locations['ojota']
+        nearby = Location.objects.near(ojota.latitude, ojota.longitude, 5)
+        assert set(nearby.values_list('name', flat=True)) == \
+            {'Ojota', 'Kosofe', 'Ikeja'}
+        ikeja = nearby.get(pk=locations['ikeja'].pk)
+        assert 3 < ikeja.distance < 5
+
+    def test_load_locations(self, tmp_path):
+        path = tmp_path / 'locations.json'
+        path.write_text(json.dumps([{
+            'name': 'Lagos', 'kind': 'state',
+            'latitude': 6.5244, 'longitude': 3.3792,
+            'aliases': ['Lagos State'],
+            'children': [{'name': 'Ikeja', 'kind': 'lga'}],
+        }]))
+
+        out = StringIO()
+        for _ in range(2):
+            call_command('load_locations', str(path), stdout=out)
+
+        assert 'Loaded 2 locations' in out.getvalue()
+        assert Location.objects.count() == 2
+        assert Location.objects.resolve('Lagos State, Ikeja') == \
+            Location.objects.get(name='Ikeja').pk
+
+
+def test_find_logistic(locations):
+    package = baker.make(
+        PricePackage, from_location='Ojota', to_location='Ibadan')
+    assert package.from_place_id == locations['ojota'].pk
+    baker.make(PricePackage, from_location='Ogun', to_location='Oyo')
+
+    results = PricePackage.objects.find_logistic('Lagos', 'Oyo')
+    assert [obj.pk for obj in results] == [package.pk]
+
+
+def test_resolve_locations(locations):
+    package = baker.make(
+        PricePackage, from_location='Ikeja', to_location='Kano')
+    Location.objects.filter(name='Ikeja').delete()
+    Location.objects.create(name='Ikeja', kind='state')
+
+    call_command('resolve_locations', stdout=StringIO())
+    package.refresh_from_db()
+    assert package.from_place == Location.objects.get(name='Ikeja')
+    assert package.to_place is None
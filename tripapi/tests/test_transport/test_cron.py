@@ -0,0 +1,62 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from transport.cron import roll_trip_windows
+from transport.models import TripObject, TripPlan
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def recurring_plans(trip_plan, base_trip_data, settings):
+    plans = [trip_plan]
+    for recurring in (settings.EVERYDAY, 'monday', ''):
+        plan = TripPlan(
+            **base_trip_data,
+            pre_booked_seats=2,
+            start_date=datetime.date.today(),
+            recurring=recurring,
+        )
+        plan.save()
+        plans.append(plan)
+    TripObject.objects.all().delete()
+    return plans
+
+
+def test_roll_trip_windows(recurring_plans, settings):
+    totals = roll_trip_windows(batch_size=2)
+
+    assert totals['plans'] == 3
+    assert TripObject.objects.count() == totals['created']
+    for plan in recurring_plans[:3]:
+        assert plan.get_trip_objects().count() == \
+            len(plan.get_leave_dates(datetime.date.today()))
+    assert recurring_plans[3].get_trip_objects().count() == 0
+
+
+def test_roll_trip_windows_idempotent(recurring_plans):
+    roll_trip_windows()
+    count = TripObject.objects.count()
+
+    totals = roll_trip_windows()
+    assert totals['created'] == 0
+    assert TripObject.objects.count() == count
+
+
+def test_roll_trip_windows_deletes_old_trips(recurring_plans):
+    old_date = datetime.date.today() - datetime.timedelta(days=3)
+    recurring_plans[0].build_trip_object(old_date).save()
+
+    totals = roll_trip_windows()
+    assert totals['deleted'] == 1
+    assert not TripObject.objects.filter(leave_date=old_date).exists()
+
+
+def test_roll_trip_windows_command(recurring_plans):
+    out = StringIO()
+    call_command('roll_trip_windows', '--batch-size', '1', stdout=out)
+    output = out.getvalue()
+    assert output.count('Rolled') == 3
+    assert 'Done: 3 plans' in output
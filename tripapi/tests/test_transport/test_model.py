@@ -4,9 +4,11 @@ from time import sleep
 from typing import Type, TypeVar
 
 import pytest
-from django.db.models import QuerySet
+from django.contrib.postgres.search import SearchQuery
+from django.db.models import F, QuerySet
 from model_bakery import baker
-from transport.models import Booking, Passenger, TripObject, TripPlan
+from transport.models import (Booking, Passenger, TripAvailability,
+                              TripObject, TripPlan)
 from transport.utils.base import get_next_day_date
 from utils.base.constants import TOMORROW, unit
 from utils.base.general import get_day_value, capture_output
@@ -99,6 +101,32 @@ class TestTripPlan():
         for obj in trip_objects:
             assert obj.destination == 'London'
 
+    def test_similarize_data_on_trips(
+        self, trip_plan: Type[TripPlan], django_assert_max_num_queries
+    ):
+        booked = trip_plan.get_trip_objects().first()
+        TripObject.objects.filter(pk=booked.pk).update(
+            passengers_count=F('passengers_count') + 2)
+
+        trip_plan.pre_booked_seats = 2
+        trip_plan.amount = 6000
+        with django_assert_max_num_queries(5):
+            trip_plan.similarize_data_on_trips()
+
+        capacity = trip_plan.vehicle.capacity
+        for obj in trip_plan.get_trip_objects():
+            passengers_count = 4 if obj.pk == booked.pk else 2
+            assert obj.amount == 6000
+            assert obj.passengers_count == passengers_count
+            assert obj.available_seats == capacity - passengers_count
+
+    def test_similarize_data_on_trips_capacity(
+        self, trip_plan: Type[TripPlan]
+    ):
+        trip_plan.vehicle.capacity = 2
+        with pytest.raises(ValueError):
+            trip_plan.similarize_data_on_trips()
+
     def test_get_clone_data(self, trip_plan: Type[TripPlan], base_trip_data):
         base_trip_data['passengers_count'] = trip_plan.pre_booked_seats
         unit.assertDictContainsSubset(
@@ -135,6 +163,36 @@ class TestTripPlan():
         trip_objects: QuerySet[TripObject] = trip_plan.get_trip_objects()
         assert trip_objects.count() == 10
 
+    def test_generate_trips_queries(
+        self, settings, trip_plan: Type[TripPlan],
+        django_assert_max_num_queries
+    ):
+        trip_plan.get_trip_objects().delete()
+        trip_plan.recurring = settings.EVERYDAY
+
+        with django_assert_max_num_queries(4):
+            trip_plan.generate_trips()
+
+        trip_objects: QuerySet[TripObject] = trip_plan.get_trip_objects()
+        assert trip_objects.count() == settings.MAX_TRIP_PLANS_DAYS
+        expected_seats = trip_plan.vehicle.capacity - \
+            trip_plan.pre_booked_seats
+        for obj in trip_objects:
+            assert obj.tracking_code
+            assert obj.available_seats == expected_seats
+
+    def test_stabilize_keeps_started_trips(
+        self, old_trip_plan: Type[TripPlan]
+    ):
+        started = old_trip_plan.get_trip_objects().first()
+        baker.make(Booking, trip=started, state='confirmed')
+
+        old_trip_plan.stabilize_trip_objects()
+
+        trip_objects: QuerySet[TripObject] = old_trip_plan.get_trip_objects()
+        assert trip_objects.filter(pk=started.pk).exists()
+        assert trip_objects.count() == 6
+
     def test_delete_tripplaning(self, trip_plan: Type[TripPlan]):
         pk = trip_plan.pk
         trip_plan.delete()
@@ -379,10 +437,108 @@ class TestTripObjectManager():
             ),
         ]
     )
-    def test_search(self, query, expected):
-        results = TripObject.objects.find_trips(**query)
+    @pytest.mark.parametrize("from_availability", [False, True])
+    def test_search(self, query, expected, from_availability):
+        results = TripObject.objects.find_trips(
+            **query, from_availability=from_availability)
         assert results.count() == expected
 
+    @pytest.mark.usefixtures("create_search_trips")
+    def test_search_availability_parity(self):
+        query = {
+            "origin": "Lagos",
+            "destination": "Ibadan",
+            "leave_date": TOMORROW,
+            "passengers": 1,
+        }
+        joined = TripObject.objects.find_trips(
+            **query, from_availability=False)
+        flat = TripObject.objects.find_trips(
+            **query, from_availability=True)
+        assert [trip.pk for trip in joined] == [trip.pk for trip in flat]
+
+    def test_resolve_places(self, locations, base_trip_data):
+        trip = TripObject(
+            **{**base_trip_data, 'origin': 'Lagos, Ojota'},
+            leave_date=TOMORROW)
+        trip.save()
+        assert trip.origin_place_id == locations['ojota'].pk
+        assert trip.destination_place_id == locations['ibadan'].pk
+
+        TripObject.objects.filter(pk=trip.pk).update(origin='Ikeja')
+        trip.refresh_from_db()
+        assert trip.origin_place_id == locations['ikeja'].pk
+
+        trip.destination = 'Kano'
+        trip.save()
+        assert trip.destination_place_id is None
+
+    @pytest.mark.parametrize("from_availability", [False, True])
+    def test_search_places(
+        self, locations, base_trip_data, from_availability
+    ):
+        trip = TripObject(
+            **{**base_trip_data, 'origin': 'Ojota motor park'},
+            leave_date=TOMORROW)
+        trip.save()
+        query = {
+            "destination": "Ibadan North",
+            "leave_date": TOMORROW,
+            "passengers": 1,
+            "from_availability": from_availability,
+        }
+
+        # Matched on locations, not on the text
+        results = TripObject.objects.find_trips(origin='Lagos', **query)
+        assert [obj.pk for obj in results] == [trip.pk]
+
+        results = TripObject.objects.find_trips(origin='Ogun', **query)
+        assert not results.exists()
+
+        results = TripObject.objects.find_trips(
+            origin='Ikeja', radius_km=5, **query)
+        assert [obj.pk for obj in results] == [trip.pk]
+
+        # Unknown locations still match on text
+        trip.origin = 'Kano'
+        trip.save()
+        results = TripObject.objects.find_trips(origin='Kano', **query)
+        assert [obj.pk for obj in results] == [trip.pk]
+
+    def test_availability_sync(self, trip_object):
+        availability = TripAvailability.objects.get(trip=trip_object)
+        assert availability.origin == 'lagos'
+        assert availability.available_seats == trip_object.available_seats
+        assert availability.with_ac
+
+        TripObject.objects.filter(pk=trip_object.pk)\
+            .update(amount=100, origin='Kano')
+        availability.refresh_from_db()
+        assert availability.amount == 100
+        assert availability.origin == 'kano'
+        assert TripAvailability.objects.filter(
+            origin_vector=SearchQuery('Kano')).exists()
+
+        vehicle = trip_object.vehicle
+        vehicle.with_ac = False
+        vehicle.kind = 'bus'
+        vehicle.save()
+        availability.refresh_from_db()
+        assert not availability.with_ac
+        assert availability.vehicle_kind == 'bus'
+
+        trip_object.delete()
+        assert not TripAvailability.objects.exists()
+
+    def test_search_vectors(self, trip_object):
+        queryset = TripObject.objects.filter(pk=trip_object.pk)
+        assert queryset.filter(origin_vector=SearchQuery('Lagos')).exists()
+
+        queryset.update(origin='Kano, Sabon Gari')
+        assert queryset.filter(origin_vector=SearchQuery('Kano')).exists()
+        assert not queryset.filter(
+            origin_vector=SearchQuery('Lagos')).exists()
+
     @pytest.mark.usefixtures("create_search_trips")
     def test_search_cache(self, settings):
         settings.SEARCH_TRIPS_CACHE_TIME_IN_SECONDS = 1
@@ -411,6 +567,23 @@ class TestTripObjectManager():
         with capture_output(call) as output:
             assert_value("1", output)
 
+    @pytest.mark.usefixtures("create_search_trips")
+    def test_search_cache_invalidation(self):
+        query = {
+            "origin": "Lagos, ojota",
+            "destination": "Ibadan",
+            "leave_date": TOMORROW,
+            "passengers": 2,
+        }
+        results = list(TripObject.objects.find_trips(**query))
+        cached = list(TripObject.objects.find_trips(**query))
+        assert len(results) == 2
+        assert results == cached
+
+        TripObject.objects.filter(pk=results[0].pk).update(available_seats=1)
+        results = TripObject.objects.find_trips(**query)
+        assert results.count() == 1
+
 
 class TestVehicleModel():
     pass
@@ -2,7 +2,10 @@ import datetime
 
 import pytest
 from transport.utils.base import (generate_next_everydays,
-                                  generate_next_n_days, get_next_day_date)
+                                  generate_next_n_days,
+                                  get_many_recurring_dates,
+                                  get_next_day_date, get_recurring_dates,
+                                  parse_recurring_days)
 
 
 def test_generate_next_n_days(settings):
@@ -51,3 +54,46 @@ def test_get_next_day_date(begin, day, expected):
     start = datetime.date(*begin)
     expected_date = datetime.date(*expected)
     assert expected_date == get_next_day_date(start, day)
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ('everyday', (0, 1, 2, 3, 4, 5, 6)),
+        ('friday', (4,)),
+        ('Friday', (4,)),
+        ('mon,wed,fri', (0, 2, 4)),
+        ('fri, Monday,wed', (0, 2, 4)),
+    ]
+)
+def test_parse_recurring_days(value, expected):
+    assert parse_recurring_days(value) == expected
+
+
+@pytest.mark.parametrize("value", ['funday', 'mon,,fri', 'mon;fri'])
+def test_parse_recurring_days_invalid(value):
+    with pytest.raises(ValueError):
+        parse_recurring_days(value)
+
+
+def test_get_recurring_dates_many_days():
+    begin = datetime.date(2022, 8, 12)
+    computed = get_recurring_dates(begin, 'mon,fri', 14)
+    expected = (
+        datetime.date(2022, 8, 12),
+        datetime.date(2022, 8, 15),
+        datetime.date(2022, 8, 19),
+        datetime.date(2022, 8, 22),
+        datetime.date(2022, 8, 26),
+        datetime.date(2022, 8, 29),
+    )
+    assert computed == expected
+
+
+def test_get_many_recurring_dates(settings):
+    settings.MAX_TRIP_PLANS_DAYS = 30
+    begin = datetime.date(2022, 8, 12)
+    items = [(begin, 'everyday'), (begin, 'friday'), (begin, 'sat,sun')]
+    computed = get_many_recurring_dates(items)
+    assert [len(dates) for dates in computed] == [30, 5, 10]
+    assert computed[1] == tuple(generate_next_n_days(begin, 'friday'))
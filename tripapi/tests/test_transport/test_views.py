@@ -7,7 +7,7 @@ from project_api_key.models import ProjectApiKey
 from rest_framework import status
 from rest_framework.reverse import reverse
 from rest_framework.test import APITestCase
-from transport.models import Driver, Transporter
+from transport.models import Driver, Transporter, TripObject
 from utils.base.constants import TOMORROW
 
 from utils.base._types import _R
@@ -356,10 +356,25 @@ class TestTripObjectAPI():
 
     def test_trip_all(self, get, baked_trips):
         url = reverse('transport:trip-all')
-        response: _R = get(url)
+        response: _R = get(url, {'count': 'true'})
         assert response.status_code == status.HTTP_200_OK
         assert response.json()["data"]['count'] == len(baked_trips)
 
+    def test_trip_all_cursor(self, get, baked_trips):
+        url = reverse('transport:trip-all') + '?page_size=2'
+        codes = []
+        while url:
+            response: _R = get(url)
+            assert response.status_code == status.HTTP_200_OK
+            data = response.json()["data"]
+            assert 'count' not in data
+            codes += [trip['tracking_code'] for trip in data['results']]
+            url = data['next']
+
+        expected = TripObject.objects.order_by('leave_date', 'pk')\
+            .values_list('tracking_code', flat=True)
+        assert codes == list(expected)
+
     @pytest.mark.usefixtures('trip_plan')
     def test_trip_started(self, transporter_get):
         url = reverse('transport:trip-started')
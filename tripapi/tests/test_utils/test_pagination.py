@@ -0,0 +1,59 @@
+import pytest
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from tests.models import ModelText
+from utils.base.pagination import KeysetPagination
+
+pytestmark = pytest.mark.django_db
+
+factory = APIRequestFactory()
+
+
+class View:
+    cursor_ordering = ('name',)
+
+
+def paginate(url: str, **params):
+    paginator = KeysetPagination()
+    request = Request(factory.get(url, params))
+    page = paginator.paginate_queryset(
+        ModelText.objects.all(), request, View())
+    return paginator, [obj.name for obj in page]
+
+
+@pytest.fixture
+def texts():
+    names = ['e', 'a', 'c', 'b', 'c', 'd', 'a']
+    ModelText.objects.bulk_create([ModelText(name=name) for name in names])
+    return sorted(names)
+
+
+def test_keyset_pages(texts, django_assert_num_queries):
+    names, url = [], '/texts/'
+    with django_assert_num_queries(3):
+        while url:
+            paginator, page = paginate(url, page_size=3)
+            names += page
+            url = paginator.get_next_link()
+    assert names == texts
+    assert paginator.count is None
+
+    # Walk back from the last page
+    previous = paginator.get_previous_link()
+    paginator, page = paginate(previous)
+    assert page == texts[3:6]
+    assert paginator.get_next_link() is not None
+
+
+def test_keyset_count(texts):
+    paginator, page = paginate('/texts/', page_size=2, count='true')
+    assert paginator.count == len(texts)
+    assert paginator.get_previous_link() is None
+    response = paginator.get_paginated_response(page)
+    assert list(response.data) == ['count', 'next', 'previous', 'results']
+
+
+def test_keyset_invalid_cursor(texts):
+    with pytest.raises(NotFound):
+        paginate('/texts/', cursor='invalid')
@@ -127,7 +127,9 @@ class TripTemplateSerializer(
 
     class Meta:
         model = TripPlan
-        exclude = ('id', 'transporter')
+        exclude = (
+            'id', 'transporter', 'origin_vector', 'destination_vector',
+            'origin_place', 'destination_place')
         read_only_fields = ('tracking_code', 'created',)
         extra_kwargs = {
             'driver': {'write_only': True},
@@ -174,7 +176,10 @@ class TripSerializer(
 
     class Meta:
         model = TripObject
-        exclude = ('id', 'transporter', "available_seats")
+        exclude = (
+            'id', 'transporter', "available_seats",
+            'origin_vector', 'destination_vector',
+            'origin_place', 'destination_place')
         read_only_fields = ('tracking_code', 'created',)
 
 
@@ -12,6 +12,7 @@ from transport.models import (Booking, Driver, Passenger, Transporter,
 from utils.base.general import choices_to_dict, regexify
 from utils.base.logger import err_logger  # noqa
 from utils.base.mixins import ListMixinUtils, UpdateRetrieveViewSet
+from utils.base.pagination import CustomPagination, KeysetPagination
 
 from .serializers import (BookingSerializer, ChoiceSerializer,
                           DriverSerializer, PassengerSerializer,
@@ -140,6 +141,14 @@ class TripViewSet(ListMixinUtils, TripTemplateViewSet):
     """
     serializer_class = TripSerializer
     model = TripObject
+    cursor_ordering = ('leave_date',)
+
+    @property
+    def pagination_class(self):
+        # Search results keep their ranked order
+        if self.action == 'search':
+            return CustomPagination
+        return KeysetPagination
 
     def get_queryset(self) -> TripQueryset:
         return self.get_all_queryset().filter(
@@ -231,6 +240,8 @@ class BookingViewSet(ListMixinUtils, viewsets.ModelViewSet):
     serializer_class = BookingSerializer
     permission_classes = (AuthUserIsTransporter,)
     lookup_field = 'tracking_code'
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-created',)
 
     def get_queryset(self):
         return Booking.objects.filter(
@@ -0,0 +1,122 @@
+"""
+Scheduled jobs for transport, registered in settings.CRONJOBS
+"""
+
+import datetime
+from typing import Callable, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from utils.base.general import today
+from utils.base.logger import err_logger, logger  # noqa
+
+from .models import TripObject, TripPlan
+from .utils.base import get_many_recurring_dates
+
+ROLL_TRIP_WINDOWS_LOCK = 'roll-trip-windows-lock'
+
+
+def get_recurring_plans():
+    """Trip plans that keep generating trips"""
+    return TripPlan.objects\
+        .exclude(recurring__isnull=True)\
+        .exclude(recurring='')\
+        .select_related('vehicle', 'transporter', 'driver')\
+        .order_by('pk')
+
+
+def roll_plans(plans: List[TripPlan], start_date: datetime.date) -> Dict:
+    """
+    Top up the trips of a batch of plans for the next
+    `MAX_TRIP_PLANS_DAYS` days from start_date and delete their
+    unstarted trips before start_date.
+
+    Existing leave dates of the whole batch are read in one query
+    and missing trips are created with one bulk create, so running
+    it again for the same day creates nothing.
+    """
+    existing = TripObject.objects.filter(
+        plan__in=plans, leave_date__gte=start_date
+    ).values_list('plan_id', 'leave_date')
+
+    existing_dates = {plan.pk: set() for plan in plans}
+    for plan_id, leave_date in existing:
+        existing_dates[plan_id].add(leave_date)
+
+    leave_dates = get_many_recurring_dates(
+        (start_date, plan.recurring) for plan in plans)
+
+    trips = []
+    for plan, dates in zip(plans, leave_dates):
+        trips += plan.build_missing_trips(dates, existing_dates[plan.pk])
+
+    with transaction.atomic():
+        if trips:
+            TripObject.objects.bulk_create(trips)
+        _, deleted = TripObject.objects.filter(
+            plan__in=plans, leave_date__lt=start_date
+        ).get_unstarted().delete()
+
+    return {
+        'plans': len(plans),
+        'created': len(trips),
+        'deleted': deleted.get(TripObject._meta.label, 0),
+    }
+
+
+def roll_trip_windows(
+    batch_size: int = None, start_date: datetime.date = None,
+    progress: Callable[[Dict], None] = None
+) -> Dict:
+    """
+    Keep every recurring trip plan filled with trips for the next
+    `MAX_TRIP_PLANS_DAYS` days, plans are processed in batches
+    of batch_size ordered by id.
+
+    :param batch_size: plans per batch, defaults to
+    settings.ROLL_TRIP_WINDOWS_BATCH_SIZE
+    :type batch_size: int, optional
+    :param start_date: first leave date of the window, defaults to today
+    :type start_date: datetime.date, optional
+    :param progress: called with the running totals after each batch
+    , defaults to None
+    :type progress: Callable[[Dict], None], optional
+    :return: amount of plans rolled, trips created and deleted
+    :rtype: Dict
+    """
+    if batch_size is None:
+        batch_size = settings.ROLL_TRIP_WINDOWS_BATCH_SIZE
+    if start_date is None:
+        start_date = today()
+
+    totals = {'plans': 0, 'created': 0, 'deleted': 0}
+
+    # Skip when another run is still in progress
+    if not cache.add(
+        ROLL_TRIP_WINDOWS_LOCK, True,
+        settings.ROLL_TRIP_WINDOWS_LOCK_TIME_IN_SECONDS
+    ):
+        logger.info('roll_trip_windows skipped, already running')
+        return totals
+
+    try:
+        plans = get_recurring_plans()
+        last_pk = 0
+        while True:
+            batch = list(plans.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            last_pk = batch[-1].pk
+
+            result = roll_plans(batch, start_date)
+            for key, value in result.items():
+                totals[key] += value
+
+            if progress is not None:
+                progress(totals)
+    finally:
+        cache.delete(ROLL_TRIP_WINDOWS_LOCK)
+
+    logger.info(f'roll_trip_windows finished {totals}')
+    return totals
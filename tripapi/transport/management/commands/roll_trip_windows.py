@@ -0,0 +1,39 @@
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from transport.cron import roll_trip_windows
+
+
+class Command(BaseCommand):
+    help = 'Create the trips of recurring trip plans for the next \
+MAX_TRIP_PLANS_DAYS days and delete their old unstarted trips'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int,
+            default=settings.ROLL_TRIP_WINDOWS_BATCH_SIZE,
+            help='Amount of trip plans processed per batch')
+        parser.add_argument(
+            '--start-date', type=datetime.date.fromisoformat,
+            help='First leave date of the window as YYYY-MM-DD, \
+defaults to today')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size < 1:
+            raise CommandError('--batch-size must be greater than 0')
+
+        def progress(totals):
+            self.stdout.write(
+                "Rolled {plans} plans, created {created} trips, "
+                "deleted {deleted} trips".format(**totals))
+
+        totals = roll_trip_windows(
+            batch_size=batch_size,
+            start_date=options['start_date'],
+            progress=progress)
+
+        self.stdout.write(self.style.SUCCESS(
+            "Done: {plans} plans, {created} trips created, "
+            "{deleted} trips deleted".format(**totals)))
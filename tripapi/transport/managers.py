@@ -1,20 +1,98 @@
 import datetime
-from typing import Dict, Type, TypeVar, overload
+from typing import Dict, Iterable, List, Type, TypeVar, overload
+from uuid import uuid4
 
-from django.contrib.postgres.search import (SearchQuery, SearchRank,
-                                            SearchVector)
-from django.db.models import Manager, QuerySet
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import (Case, F, FloatField, IntegerField, Manager,
+                              QuerySet, Value, When)
 from utils.base.crypto import hash_digest
 from django.core.cache import cache as _cache
 from django.conf import settings
 from django.core.cache.backends.base import BaseCache
+from django.db import connections
 from django.db.models import Q
 from utils.base.db import count_queries  # noqa
+from utils.base.mixins import (ResolvedLocationQuerySet, SearchVectorQuerySet,
+                               get_location_model)
 
 
 cache: Type[BaseCache] = _cache
 _QS = TypeVar("_QS", bound=QuerySet)
 
+# Trip fields that can change the results of a trip search
+SEARCH_CACHE_FIELDS = (
+    'available_seats', 'state', 'amount', 'leave_date',
+    'origin', 'destination', 'take_off_time', 'vehicle', 'vehicle_id',
+    'origin_place', 'origin_place_id',
+    'destination_place', 'destination_place_id',
+)
+
+
+def get_search_version_key(leave_date) -> str:
+    return f"find-trips-version:{leave_date}"
+
+
+def get_search_version(leave_date) -> str:
+    """
+    Get the current search cache version for a leave date,
+    cached results of older versions are never read again
+    """
+    key = get_search_version_key(leave_date)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_search_cache(leave_dates: Iterable):
+    """
+    Bump the search cache version of the leave dates so
+    cached trip searches for those dates are recomputed
+    """
+    versions = {
+        get_search_version_key(leave_date): uuid4().hex
+        for leave_date in set(leave_dates) if leave_date is not None}
+    if versions:
+        cache.set_many(versions, None)
+
+
+def normalize_search_text(text: str) -> str:
+    return ' '.join(str(text).lower().replace(',', ' ').split())
+
+
+def get_route_filter(
+    origin: str, destination: str, radius_km: float = None
+) -> Q:
+    """
+    Filter trips on origin and destination by their resolved registry
+    locations, and by text for trips or searches the registry
+    does not know
+    """
+    locations = get_location_model().objects
+    from_query = SearchQuery(origin)
+    to_query = SearchQuery(destination)
+    return locations.get_match_q(
+        'origin_place', origin, Q(origin_vector=from_query), radius_km) & \
+        locations.get_match_q(
+            'destination_place', destination,
+            Q(destination_vector=to_query), radius_km)
+
+
+def get_search_cache_key(query: dict) -> str:
+    """
+    Build a cache key for a trip search from its normalized
+    parameters and the search version of its leave date
+    """
+    normalized = dict(query)
+    for key in ('origin', 'destination'):
+        normalized[key] = normalize_search_text(normalized[key])
+    preferences = normalized.pop('preferences', None) or {}
+    normalized['preferences'] = sorted(preferences.items())
+    normalized = sorted((key, str(value)) for key, value in normalized.items())
+    version = get_search_version(query['leave_date'])
+    return f"find-trips:{version}:{hash_digest(normalized)}"
+
 
 class VehicleQueryset(QuerySet):
     def create(self, **kwargs):
@@ -30,7 +108,7 @@ class VehicleManager(Manager):
         return self.get_queryset().create(**kwargs)
 
 
-class TripQueryset(QuerySet):
+class TripQueryset(ResolvedLocationQuerySet, SearchVectorQuerySet):
     def get_pending(self):
         return self.filter(state='pending')
 
@@ -43,6 +121,10 @@ class TripQueryset(QuerySet):
     def get_cancelled(self):
         return self.filter(state='cancelled')
 
+    def get_unstarted(self):
+        """Trips that have no confirmed booking"""
+        return self.exclude(booking__state='confirmed')
+
     # @count_queries
     def find_trips(
         self, origin: str, destination: str,
@@ -50,7 +132,9 @@ class TripQueryset(QuerySet):
         min_take_off_time: datetime.time = None,
         max_take_off_time: datetime.time = None,
         max_amount: int = None, vehicle_type: str = None,
-        preferences: Dict[str, bool] = None
+        preferences: Dict[str, bool] = None,
+        radius_km: float = None,
+        from_availability: bool = None
     ) -> _QS:
         """
         Search trips in queryset with parameters
@@ -75,6 +159,13 @@ class TripQueryset(QuerySet):
         :type vehicle_type: str, optional
         :param preferences: specifications for vehicle, defaults to None
         :type preferences: Dict[str, bool], optional
+        :param radius_km: match trips with origin and destination within
+        radius_km of the searched locations, defaults to None
+        :type radius_km: float, optional
+        :param from_availability: search the flattened TripAvailability
+        table instead of joining trips and vehicles, defaults to
+        settings.SEARCH_TRIPS_FROM_AVAILABILITY
+        :type from_availability: bool, optional
         :return: _description_
         :rtype: _QS
         """
@@ -82,16 +173,27 @@ class TripQueryset(QuerySet):
         kwargs = locals()
         kwargs.pop("self")
 
-        key = hash_digest(kwargs)
-        value = cache.get(key)
+        key = get_search_cache_key(kwargs)
+        results = cache.get(key)
+
+        if results is not None:
+            return self.from_search_results(results)
 
-        if value is not None:
-            cache.add(
-                key, value, settings.SEARCH_TRIPS_CACHE_TIME_IN_SECONDS)
-            return value
+        if from_availability is None:
+            from_availability = settings.SEARCH_TRIPS_FROM_AVAILABILITY
 
-        from_vector = SearchVector('origin')
-        to_vector = SearchVector('destination')
+        if from_availability:
+            kwargs.pop('from_availability')
+            availability = self.model.get_availability_model()
+            results = availability.objects.find_trips(**kwargs)
+            cache.set(
+                key, results, settings.SEARCH_TRIPS_CACHE_TIME_IN_SECONDS)
+            return self.from_search_results(results)
+
+        # Match on resolved locations or the stored vectors so indexes
+        # are used, ranking is only computed for matched rows
+        from_vector = F('origin_vector')
+        to_vector = F('destination_vector')
         from_query = SearchQuery(origin)
         to_query = SearchQuery(destination)
 
@@ -100,10 +202,10 @@ class TripQueryset(QuerySet):
 
         queryset = self\
             .select_related("transporter", "driver", "vehicle")\
+            .filter(get_route_filter(origin, destination, radius_km))\
             .annotate(from_rank=from_ranking)\
             .annotate(to_rank=to_ranking)\
-            .order_by('-from_rank', '-to_rank')\
-            .filter(Q(from_rank__gte=0.000001) & Q(to_rank__gte=0.000001))\
+            .order_by('-from_rank', '-to_rank')
 
         queryset = queryset.filter(leave_date=leave_date)
         queryset = queryset.filter(available_seats__gte=passengers)
@@ -126,11 +228,76 @@ class TripQueryset(QuerySet):
                     f"vehicle__specifications__{preference}": value}
                 queryset = queryset.filter(**queryobj)
 
+        # Evaluate once and cache only the ranked ids, so hits are served
+        # with fresh rows and never with a pickled query
+        results = [
+            (trip.pk, trip.from_rank, trip.to_rank) for trip in queryset]
         cache.set(
-            key, queryset, settings.SEARCH_TRIPS_CACHE_TIME_IN_SECONDS)
+            key, results, settings.SEARCH_TRIPS_CACHE_TIME_IN_SECONDS)
 
         return queryset
 
+    def from_search_results(self, results: List[tuple]) -> _QS:
+        """
+        Get the trips of cached search results in their ranked order
+
+        :param results: list of trip id, from rank and to rank
+        :type results: List[tuple]
+        :return: trips ordered like results
+        :rtype: _QS
+        """
+        if not results:
+            return self.none()
+
+        def case(index, output_field):
+            return Case(
+                *[When(pk=result[0], then=Value(result[index]))
+                  for result in results],
+                output_field=output_field)
+
+        position = Case(
+            *[When(pk=result[0], then=Value(index))
+              for index, result in enumerate(results)],
+            output_field=IntegerField())
+
+        return self\
+            .select_related("transporter", "driver", "vehicle")\
+            .filter(pk__in=[result[0] for result in results])\
+            .annotate(from_rank=case(1, FloatField()))\
+            .annotate(to_rank=case(2, FloatField()))\
+            .order_by(position)
+
+    def update(self, **kwargs):
+        if set(kwargs) & set(SEARCH_CACHE_FIELDS):
+            trips = dict(self.values_list('pk', 'leave_date'))
+            rows = super().update(**kwargs)
+            self.model.refresh_availability(trips.keys())
+            invalidate_search_cache(
+                [*trips.values(), kwargs.get('leave_date')])
+            return rows
+        return super().update(**kwargs)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        self.model.refresh_availability(
+            [obj.pk for obj in objs if obj.pk is not None])
+        invalidate_search_cache(obj.leave_date for obj in objs)
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        if not set(fields) & set(SEARCH_CACHE_FIELDS):
+            return super().bulk_update(objs, fields, *args, **kwargs)
+
+        leave_dates = set(obj.leave_date for obj in objs)
+        if 'leave_date' in fields:
+            leave_dates.update(self.filter(
+                pk__in=[obj.pk for obj in objs]
+            ).values_list('leave_date', flat=True))
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        self.model.refresh_availability([obj.pk for obj in objs])
+        invalidate_search_cache(leave_dates)
+        return rows
+
 
 class TripManager(Manager):
     def get_queryset(self):
@@ -163,6 +330,137 @@ class TripManager(Manager):
         return self.get_queryset().find_trips(**kwargs)
 
 
+# Upsert availability rows of trips from the trips and their
+# vehicles in a single statement
+REFRESH_AVAILABILITY_SQL = """
+INSERT INTO {table} ({columns})
+SELECT {values}
+FROM {trip_table} trip
+JOIN {vehicle_table} vehicle ON vehicle.id = trip.vehicle_id
+WHERE trip.id = ANY(%s)
+ON CONFLICT (trip_id) DO UPDATE SET {updates}
+"""
+
+# Same normalization as normalize_search_text
+NORMALIZE_SEARCH_TEXT_SQL = "lower(btrim(regexp_replace({}, '[,\\s]+', ' ', 'g')))"
+
+
+class TripAvailabilityQueryset(SearchVectorQuerySet):
+    def get_refresh_columns(self) -> Dict[str, str]:
+        """Columns of an availability row and their sql values"""
+        columns = {
+            'trip_id': 'trip.id',
+            'origin': NORMALIZE_SEARCH_TEXT_SQL.format('trip.origin'),
+            'destination': NORMALIZE_SEARCH_TEXT_SQL.format(
+                'trip.destination'),
+            'origin_place_id': 'trip.origin_place_id',
+            'destination_place_id': 'trip.destination_place_id',
+            'leave_date': 'trip.leave_date',
+            'take_off_time': 'trip.take_off_time',
+            'amount': 'trip.amount',
+            'available_seats': 'trip.available_seats',
+            'state': 'trip.state',
+            'vehicle_kind': 'vehicle.kind',
+            'origin_vector': "to_tsvector(COALESCE(trip.origin, ''))",
+            'destination_vector':
+                "to_tsvector(COALESCE(trip.destination, ''))",
+        }
+        for key in self.model.get_specification_keys():
+            columns[key] = "COALESCE((vehicle.specifications ->> %s)" \
+                "::boolean, {})".format(
+                    str(settings.VEHICLE_SPECIFICATION_DEFAULT).lower())
+        return columns
+
+    def refresh(self, trip_ids: Iterable[int]):
+        """
+        Rebuild the availability rows of trips from the trips
+        and their vehicles with one upsert
+        """
+        trip_ids = list(trip_ids)
+        if not trip_ids:
+            return
+
+        trip_model = self.model._meta.get_field('trip').related_model
+        vehicle_model = trip_model._meta.get_field('vehicle').related_model
+        columns = self.get_refresh_columns()
+
+        sql = REFRESH_AVAILABILITY_SQL.format(
+            table=self.model._meta.db_table,
+            columns=', '.join(columns),
+            values=', '.join(columns.values()),
+            trip_table=trip_model._meta.db_table,
+            vehicle_table=vehicle_model._meta.db_table,
+            updates=', '.join(
+                f'{column} = EXCLUDED.{column}'
+                for column in columns if column != 'trip_id'),
+        )
+        params = [*self.model.get_specification_keys(), trip_ids]
+        with connections[self.db].cursor() as cursor:
+            cursor.execute(sql, params)
+
+    def find_trips(
+        self, origin: str, destination: str,
+        leave_date: datetime.date, passengers: int,
+        min_take_off_time: datetime.time = None,
+        max_take_off_time: datetime.time = None,
+        max_amount: int = None, vehicle_type: str = None,
+        preferences: Dict[str, bool] = None,
+        radius_km: float = None
+    ) -> List[tuple]:
+        """
+        Search trips with the same parameters as `TripQueryset.find_trips`
+        on this table alone
+
+        :return: list of trip id, from rank and to rank
+        :rtype: List[tuple]
+        """
+        from_query = SearchQuery(origin)
+        to_query = SearchQuery(destination)
+
+        queryset = self.filter(
+            get_route_filter(origin, destination, radius_km),
+            leave_date=leave_date,
+            available_seats__gte=passengers)
+
+        if min_take_off_time is not None:
+            queryset = queryset.filter(take_off_time__gte=min_take_off_time)
+
+        if max_take_off_time is not None:
+            queryset = queryset.filter(take_off_time__lte=max_take_off_time)
+
+        if max_amount is not None:
+            queryset = queryset.filter(amount__lte=max_amount)
+
+        if vehicle_type is not None:
+            queryset = queryset.filter(vehicle_kind=vehicle_type)
+
+        if preferences is not None:
+            spec_keys = self.model.get_specification_keys()
+            for preference, value in preferences.items():
+                if preference not in spec_keys:
+                    return []
+                queryset = queryset.filter(**{preference: value})
+
+        return list(queryset
+                    .annotate(from_rank=SearchRank(
+                        F('origin_vector'), from_query))
+                    .annotate(to_rank=SearchRank(
+                        F('destination_vector'), to_query))
+                    .order_by('-from_rank', '-to_rank')
+                    .values_list('trip_id', 'from_rank', 'to_rank'))
+
+
+class TripAvailabilityManager(Manager):
+    def get_queryset(self):
+        return TripAvailabilityQueryset(self.model, using=self._db)
+
+    def refresh(self, trip_ids: Iterable[int]):
+        return self.get_queryset().refresh(trip_ids)
+
+    def find_trips(self, **kwargs) -> List[tuple]:
+        return self.get_queryset().find_trips(**kwargs)
+
+
 class BookingQueryset(QuerySet):
     def get_unconfirmed_bookings(self):
         return self.filter(state='unconfirmed')
@@ -0,0 +1,64 @@
+# Generated by Django 4.0 on 2026-10-17 06:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def backfill_search_vectors(apps, schema_editor):
+    """Build the search vectors of existing trips and trip plans"""
+    for model_name in ('TripObject', 'TripPlan'):
+        model = apps.get_model('transport', model_name)
+        model.objects.update(
+            origin_vector=SearchVector('origin'),
+            destination_vector=SearchVector('destination'),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transport', '0009_alter_tripobject_vehicle_alter_tripplan_vehicle'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tripobject',
+            name='destination_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tripobject',
+            name='origin_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tripplan',
+            name='destination_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='tripplan',
+            name='origin_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='tripobject',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['origin_vector'], name='transport_tripobject_orig_vec'),
+        ),
+        migrations.AddIndex(
+            model_name='tripobject',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['destination_vector'], name='transport_tripobject_dest_vec'),
+        ),
+        migrations.AddIndex(
+            model_name='tripplan',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['origin_vector'], name='transport_tripplan_orig_vec'),
+        ),
+        migrations.AddIndex(
+            model_name='tripplan',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['destination_vector'], name='transport_tripplan_dest_vec'),
+        ),
+        migrations.RunPython(
+            backfill_search_vectors, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 4.0 on 2026-10-17 06:14
+
+from django.db import migrations, models
+import transport.validators
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transport', '0010_trip_search_vectors'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tripplan',
+            name='recurring',
+            field=models.CharField(blank=True, help_text='everyday, a weekday or comma separated weekdays e.g. friday or mon,wed,fri', max_length=64, null=True, validators=[transport.validators.validate_recurring_data]),
+        ),
+    ]
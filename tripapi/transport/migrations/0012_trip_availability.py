@@ -0,0 +1,78 @@
+# Generated by Django 4.0 on 2026-10-17 06:17
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+# Fill availability rows of existing trips, origin and destination are
+# normalized like transport.managers.normalize_search_text
+BACKFILL_TRIP_AVAILABILITY = r"""
+INSERT INTO transport_tripavailability (
+    trip_id, origin, destination, leave_date, take_off_time, amount,
+    available_seats, state, vehicle_kind, with_ac, with_tv, with_tint,
+    origin_vector, destination_vector
+)
+SELECT
+    trip.id,
+    lower(btrim(regexp_replace(trip.origin, '[,\s]+', ' ', 'g'))),
+    lower(btrim(regexp_replace(trip.destination, '[,\s]+', ' ', 'g'))),
+    trip.leave_date, trip.take_off_time, trip.amount,
+    trip.available_seats, trip.state, vehicle.kind,
+    COALESCE((vehicle.specifications ->> 'with_ac')::boolean, false),
+    COALESCE((vehicle.specifications ->> 'with_tv')::boolean, false),
+    COALESCE((vehicle.specifications ->> 'with_tint')::boolean, false),
+    to_tsvector(trip.origin), to_tsvector(trip.destination)
+FROM transport_tripobject trip
+JOIN transport_vehicle vehicle ON vehicle.id = trip.vehicle_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transport', '0011_alter_tripplan_recurring'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TripAvailability',
+            fields=[
+                ('trip', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='availability', serialize=False, to='transport.tripobject')),
+                ('origin', models.CharField(max_length=255)),
+                ('destination', models.CharField(max_length=255)),
+                ('leave_date', models.DateField()),
+                ('take_off_time', models.TimeField()),
+                ('amount', models.FloatField()),
+                ('available_seats', models.PositiveBigIntegerField(default=0)),
+                ('state', models.CharField(max_length=50)),
+                ('vehicle_kind', models.CharField(max_length=20)),
+                ('with_ac', models.BooleanField(default=False)),
+                ('with_tv', models.BooleanField(default=False)),
+                ('with_tint', models.BooleanField(default=False)),
+                ('origin_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('destination_vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Trip availabilities',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='tripavailability',
+            index=models.Index(fields=['origin', 'destination', 'leave_date'], name='transport_avail_route_date'),
+        ),
+        migrations.AddIndex(
+            model_name='tripavailability',
+            index=models.Index(fields=['leave_date', 'available_seats'], name='transport_avail_date_seats'),
+        ),
+        migrations.AddIndex(
+            model_name='tripavailability',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['origin_vector'], name='transport_avail_orig_vec'),
+        ),
+        migrations.AddIndex(
+            model_name='tripavailability',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['destination_vector'], name='transport_avail_dest_vec'),
+        ),
+        migrations.RunSQL(
+            BACKFILL_TRIP_AVAILABILITY, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 4.0 on 2026-10-17 06:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('locations', '0001_initial'),
+        ('transport', '0012_trip_availability'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tripavailability',
+            name='destination_place',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.location'),
+        ),
+        migrations.AddField(
+            model_name='tripavailability',
+            name='origin_place',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.location'),
+        ),
+        migrations.AddField(
+            model_name='tripobject',
+            name='destination_place',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.location'),
+        ),
+        migrations.AddField(
+            model_name='tripobject',
+            name='origin_place',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.location'),
+        ),
+        migrations.AddField(
+            model_name='tripplan',
+            name='destination_place',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.location'),
+        ),
+        migrations.AddField(
+            model_name='tripplan',
+            name='origin_place',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='locations.location'),
+        ),
+    ]
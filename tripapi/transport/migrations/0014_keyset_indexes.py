@@ -0,0 +1,21 @@
+# Generated by Django 4.0 on 2026-10-17 06:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('transport', '0013_location_places'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['created', 'id'], name='transport_booking_keyset'),
+        ),
+        migrations.AddIndex(
+            model_name='tripobject',
+            index=models.Index(fields=['transporter', 'leave_date', 'id'], name='transport_trip_keyset'),
+        ),
+    ]
@@ -4,11 +4,14 @@ import shutil
 from copy import deepcopy
 from datetime import date, time, datetime
 from pathlib import PurePath
-from typing import Type
+from typing import List, Set, Type
 
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import MaxValueValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Subquery
 from django.db.models.query import QuerySet
 from django.db.models.signals import post_delete
 from django.dispatch import receiver
@@ -21,17 +24,20 @@ from utils.base.general import (add_queryset, driver_upload_path_idcard,
                                 driver_upload_path_licence, get_model_fields,
                                 merge_querysets, split_datetime, today,
                                 vehicle_upload_path)
-from utils.base.mixins import CreatedMixin, ModelChangeFunc
+from utils.base.mixins import (CreatedMixin, ModelChangeFunc,
+                               ResolvedLocationMixin, SearchVectorMixin)
 from utils.base.validators import (validate_phone, validate_rating_level,
                                    validate_special_char)
 
-from .managers import BookingManager, TripManager, VehicleManager
+from .managers import (BookingManager, TripAvailabilityManager, TripManager,
+                       VehicleManager, invalidate_search_cache,
+                       normalize_search_text)
 from .utils.base import generate_next_n_days
 from .validators import (validate_active, validate_passengers_count,
                          validate_recurring_data, validate_start_date,
                          validate_verified)
 
-# NOTE: When writing cron jobs, it should only run for trip plans
+# NOTE: Cron jobs in transport.cron only run for trip plans
 # that have a recurring value
 # When trip plannings are deleted or updated, send mails to child bookings
 # refund them, when they are cancelled too
@@ -313,14 +319,21 @@ class Vehicle(models.Model):
         Slugified tags and saves it
         """
         self.tag = slugify(self.tag)
-        return super().save(*args, **kwargs)
+        created = not self.pk
+        data = super().save(*args, **kwargs)
+        if not created:
+            TripObject.refresh_availability(
+                list(self.tripobject_set.values_list('pk', flat=True)))
+        return data
 
     def __str__(self):
         return self.name
 
 
 # TODO: Vehicle and Driver must be active
-class TripAbstractModel(CreatedMixin):
+class TripAbstractModel(
+    CreatedMixin, SearchVectorMixin, ResolvedLocationMixin
+):
     """
     This will work like a template used to create
     other trips
@@ -364,6 +377,28 @@ for trip e.g. Oyo, Ibadan Central')
     duration = models.DurationField()  # takes in timedelta
     amount = models.FloatField(help_text='Amount payed for trip')
 
+    # Stored search vectors of origin and destination, used by trip search
+    origin_vector = SearchVectorField(null=True, editable=False)
+    destination_vector = SearchVectorField(null=True, editable=False)
+
+    search_vector_fields = {
+        'origin': 'origin_vector',
+        'destination': 'destination_vector',
+    }
+
+    # Registry locations origin and destination resolve to
+    origin_place = models.ForeignKey(
+        'locations.Location', on_delete=models.SET_NULL, null=True,
+        blank=True, editable=False, related_name='+')
+    destination_place = models.ForeignKey(
+        'locations.Location', on_delete=models.SET_NULL, null=True,
+        blank=True, editable=False, related_name='+')
+
+    location_fields = {
+        'origin': 'origin_place',
+        'destination': 'destination_place',
+    }
+
     def clean(self) -> None:
         super().clean()
         if self.driver:
@@ -376,6 +411,14 @@ for trip e.g. Oyo, Ibadan Central')
 
     class Meta:
         abstract = True
+        indexes = [
+            GinIndex(
+                fields=['origin_vector'],
+                name='%(app_label)s_%(class)s_orig_vec'),
+            GinIndex(
+                fields=['destination_vector'],
+                name='%(app_label)s_%(class)s_dest_vec'),
+        ]
 
     def get_vehicle_name(self) -> str:
         """Get the vehicle name"""
@@ -401,8 +444,10 @@ class TripPlan(TripAbstractModel, ModelChangeFunc):
     start_date = models.DateField(validators=[validate_start_date])
 
     recurring = models.CharField(
-        max_length=16, null=True, blank=True,
-        validators=[validate_recurring_data])
+        max_length=64, null=True, blank=True,
+        validators=[validate_recurring_data],
+        help_text='everyday, a weekday or comma separated weekdays \
+e.g. friday or mon,wed,fri')
 
     def get_pending_trips(self) -> QuerySet['TripObject']:
         return self.tripobject_set.get_pending()
@@ -410,21 +455,35 @@ class TripPlan(TripAbstractModel, ModelChangeFunc):
     def similarize_data_on_trips(self):
         """
         Meant to update unstarted trips to look like template,
-        will be called for updates on trip template only
+        will be called for updates on trip template only.
+
+        All pending trips are updated with a single UPDATE, the change
+        in pre booked seats is added to their passengers count and
+        their available seats are recomputed from the plan vehicle.
+        It must be called before the plan is saved, as the old pre
+        booked seats are read from the database.
         """
-        trips = self.get_pending_trips()
         data = self.get_clone_data()
-        for trip in trips:
-            for key, value in data.items():
-                setattr(trip, key, value)
-            trip.save()
+        data.pop('created')
+
+        old_pre_booked_seats = Subquery(self.__class__.objects.filter(
+            pk=self.pk).values('pre_booked_seats'))
+        passengers_count = F('passengers_count') - old_pre_booked_seats + \
+            data.pop('passengers_count')
+
+        data['passengers_count'] = passengers_count
+        data['available_seats'] = self.vehicle.capacity - passengers_count
+
+        try:
+            with transaction.atomic():
+                self.get_pending_trips().update(**data)
+        except IntegrityError:
+            raise ValueError(
+                "Vehicle capacity is not enough for passengers")
 
     def delete_inactive_trips(self):
         """Delete trips that have not started"""
-        trips = self.get_trip_objects()
-        for trip in trips:
-            if not trip.has_started():
-                trip.delete()
+        self.get_trip_objects().get_unstarted().delete()
 
     def update_trip_plans(self):
         """Delete unbooked trip plans when recurring changes
@@ -450,8 +509,15 @@ class TripPlan(TripAbstractModel, ModelChangeFunc):
         """Get the clone data to use to
         create a new trip plan object"""
         fields = get_model_fields(TripAbstractModel)
+        vector_fields = self.search_vector_fields.values()
+        location_fields = self.location_fields.values()
         data = {}
         for field in fields:
+            if field in vector_fields:
+                continue
+            if field in location_fields:
+                data[f'{field}_id'] = getattr(self, f'{field}_id')
+                continue
             data[field] = getattr(self, field)
         data['passengers_count'] = self.pre_booked_seats
         return data
@@ -462,6 +528,17 @@ class TripPlan(TripAbstractModel, ModelChangeFunc):
         data['leave_date'] = leave_date
         return self.tripobject_set.create(**data)
 
+    def build_trip_object(
+        self, leave_date: date, data: dict = None
+    ) -> Type['TripObject']:
+        """Build an unsaved trip object from this template,
+        with its available seats computed"""
+        if data is None:
+            data = self.get_clone_data()
+        trip = TripObject(**data, plan=self, leave_date=leave_date)
+        trip.available_seats = self.vehicle.capacity - trip.passengers_count
+        return trip
+
     def stabilize_trip_objects(self):
         """
         Creates new trips for trip plan template such that
@@ -471,27 +548,40 @@ class TripPlan(TripAbstractModel, ModelChangeFunc):
         be there. And old trips before today is deleted
         """
         self.generate_trips(today())
-        old_trips = self.get_trip_objects().filter(leave_date__lt=today())
-        for trip in old_trips:
-            if not trip.has_started():
-                trip.delete()
+        self.get_trip_objects().filter(
+            leave_date__lt=today()).get_unstarted().delete()
 
     def generate_trips(self, start_date=None):
         """This will create new trips for this trip template with unique
-        leave dates"""
+        leave dates, returns the created trips"""
+        dates = self.get_leave_dates(start_date)
+
+        existing_dates = set(self.get_trip_objects().filter(
+            leave_date__in=dates).values_list('leave_date', flat=True))
+
+        trips = self.build_missing_trips(dates, existing_dates)
+
+        if trips:
+            TripObject.objects.bulk_create(trips)
+        return trips
+
+    def get_leave_dates(self, start_date=None) -> List[date]:
+        """Get the leave dates of trips for this plan from start_date"""
         if start_date is None:
             start_date = self.start_date
 
         if self.recurring:
-            dates = generate_next_n_days(start_date, self.recurring)
-        else:
-            dates = [start_date]
+            return list(generate_next_n_days(start_date, self.recurring))
+        return [start_date]
 
-        for _date in dates:
-            has_leave_date = self.get_trip_objects().filter(
-                leave_date=_date).exists()
-            if not has_leave_date:
-                self.create_trip_object(_date)
+    def build_missing_trips(
+        self, dates: List[date], existing_dates: Set[date]
+    ) -> List['TripObject']:
+        """Build unsaved trips for dates not in existing_dates"""
+        data = self.get_clone_data()
+        return [
+            self.build_trip_object(_date, data)
+            for _date in dates if _date not in existing_dates]
 
     def clean_passengers(self) -> None:
         validate_passengers_count(self.pre_booked_seats, self.vehicle.capacity)
@@ -539,6 +629,15 @@ class TripObject(TripAbstractModel, ModelChangeFunc):
 
     objects: TripManager = TripManager()
 
+    class Meta(TripAbstractModel.Meta):
+        indexes = [
+            *TripAbstractModel.Meta.indexes,
+            # Keyset pagination of transporter trips
+            models.Index(
+                fields=['transporter', 'leave_date', 'id'],
+                name='transport_trip_keyset'),
+        ]
+
     def update_transporter_ratings(self):
         """Update transporter ratings"""
         self.transporter.update_ratings()
@@ -552,10 +651,19 @@ class TripObject(TripAbstractModel, ModelChangeFunc):
             raise ValueError(
                 "Vehicle capacity is not enough for passengers")
 
+    def update_search_cache(self):
+        """Invalidate cached trip searches for this trip leave dates"""
+        old_leave_date = self.get_attr(self.get_clone_field('leave_date'))
+        invalidate_search_cache((self.leave_date, old_leave_date))
+
     monitor_change = {
         'rating': update_transporter_ratings,
         'vehicle': update_available_seats,
         'passengers_count': update_available_seats,
+        'available_seats': update_search_cache,
+        'state': update_search_cache,
+        'amount': update_search_cache,
+        'leave_date': update_search_cache,
     }
 
     def get_arrival_time(self) -> time:
@@ -569,6 +677,23 @@ class TripObject(TripAbstractModel, ModelChangeFunc):
             self.available_seats = self.vehicle.capacity - \
                 self.passengers_count
         super().save(*args, **kwargs)
+        self.sync_availability()
+
+    @classmethod
+    def get_availability_model(cls) -> Type['TripAvailability']:
+        return TripAvailability
+
+    @classmethod
+    def refresh_availability(cls, trip_ids: List[int]):
+        """Rebuild the availability rows of trips with ids"""
+        if trip_ids:
+            TripAvailability.objects.refresh(trip_ids)
+
+    def sync_availability(self):
+        """Write this trip availability row from the instance"""
+        values = TripAvailability.get_trip_data(self)
+        if not TripAvailability.objects.filter(trip=self).update(**values):
+            TripAvailability.objects.create(trip=self, **values)
 
     def get_ticket_html(self):
         """Build the html ticket message"""
@@ -643,6 +768,110 @@ class TripObject(TripAbstractModel, ModelChangeFunc):
         return self.booking_set.create(**kwargs)
 
 
+class TripAvailability(SearchVectorMixin):
+    """
+    Flattened copy of the searchable data of a trip and its vehicle,
+    kept in sync on trip and vehicle writes so trip search can run
+    on a single table without joins.
+
+    Vehicle specifications are stored as boolean columns,
+    one for each key in `Vehicle.get_specification_keys`
+    """
+
+    trip = models.OneToOneField(
+        TripObject, on_delete=models.CASCADE, primary_key=True,
+        related_name='availability')
+
+    origin = models.CharField(max_length=255)
+    destination = models.CharField(max_length=255)
+    leave_date = models.DateField()
+    take_off_time = models.TimeField()
+    amount = models.FloatField()
+    available_seats = models.PositiveBigIntegerField(default=0)
+    state = models.CharField(max_length=50)
+
+    origin_place = models.ForeignKey(
+        'locations.Location', on_delete=models.SET_NULL, null=True,
+        related_name='+')
+    destination_place = models.ForeignKey(
+        'locations.Location', on_delete=models.SET_NULL, null=True,
+        related_name='+')
+
+    vehicle_kind = models.CharField(max_length=20)
+    with_ac = models.BooleanField(default=False)
+    with_tv = models.BooleanField(default=False)
+    with_tint = models.BooleanField(default=False)
+
+    origin_vector = SearchVectorField(null=True, editable=False)
+    destination_vector = SearchVectorField(null=True, editable=False)
+
+    search_vector_fields = {
+        'origin': 'origin_vector',
+        'destination': 'destination_vector',
+    }
+
+    objects: TripAvailabilityManager = TripAvailabilityManager()
+
+    class Meta:
+        verbose_name_plural = 'Trip availabilities'
+        indexes = [
+            models.Index(
+                fields=['origin', 'destination', 'leave_date'],
+                name='transport_avail_route_date'),
+            models.Index(
+                fields=['leave_date', 'available_seats'],
+                name='transport_avail_date_seats'),
+            GinIndex(
+                fields=['origin_vector'],
+                name='transport_avail_orig_vec'),
+            GinIndex(
+                fields=['destination_vector'],
+                name='transport_avail_dest_vec'),
+        ]
+
+    @classmethod
+    def get_specification_keys(cls) -> list:
+        return Vehicle.get_specification_keys()
+
+    @classmethod
+    def get_row_data(
+        cls, trip: dict, vehicle_kind: str, specifications: dict
+    ) -> dict:
+        """
+        Build the column values of a row from trip
+        values and its vehicle data
+        """
+        if isinstance(specifications, str):
+            specifications = json.loads(specifications)
+        specifications = specifications or {}
+
+        data = {
+            'origin': normalize_search_text(trip['origin']),
+            'destination': normalize_search_text(trip['destination']),
+            'origin_place_id': trip['origin_place_id'],
+            'destination_place_id': trip['destination_place_id'],
+            'leave_date': trip['leave_date'],
+            'take_off_time': trip['take_off_time'],
+            'amount': trip['amount'],
+            'available_seats': trip['available_seats'],
+            'state': trip['state'],
+            'vehicle_kind': vehicle_kind,
+        }
+        for key in cls.get_specification_keys():
+            data[key] = bool(specifications.get(
+                key, settings.VEHICLE_SPECIFICATION_DEFAULT))
+        return data
+
+    @classmethod
+    def get_trip_data(cls, trip: TripObject) -> dict:
+        """Column values of a row for a trip instance"""
+        return cls.get_row_data(
+            trip.__dict__, trip.vehicle.kind, trip.vehicle.specifications)
+
+    def __str__(self):
+        return f"{self.origin} - {self.destination} ({self.leave_date})"
+
+
 class Booking(ModelChangeFunc, CreatedMixin):
     """
     Database model for bookings created by users
@@ -666,6 +895,13 @@ class Booking(ModelChangeFunc, CreatedMixin):
 
     objects = BookingManager()
 
+    class Meta:
+        indexes = [
+            # Keyset pagination of bookings
+            models.Index(
+                fields=['created', 'id'], name='transport_booking_keyset'),
+        ]
+
     def update_trip(self):
         self.trip.update_ratings()
 
@@ -841,13 +1077,16 @@ def delete_vehicle_files(sender, instance: Type[Vehicle], **kwargs):
             pass
 
 
+@receiver(post_delete, sender=TripObject)
+def invalidate_deleted_trip_search(sender, instance: Type[TripObject], **kwargs):
+    """Remove deleted trips from cached trip searches"""
+    invalidate_search_cache((instance.leave_date,))
+
+
 @receiver(post_delete, sender=TripPlan)
 def delete_unbooked_trips(sender, instance: Type[TripPlan], **kwargs):
     """
     Delete trips that have not started yet when
     trip planning is deleted
     """
-    trips = instance.get_trip_objects()
-    for trip in trips:
-        if not trip.has_started():
-            trip.delete()
+    instance.get_trip_objects().get_unstarted().delete()
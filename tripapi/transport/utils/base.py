@@ -1,20 +1,51 @@
 # Functions needed for just transport features
 
 import datetime
+from functools import lru_cache
+from typing import Iterable, List, Tuple
+
 from django.conf import settings
-from utils.base.constants import DAY, WEEKDAYS_COUNT
+from utils.base.constants import DAY, WEEKDAYS, WEEKDAYS_COUNT
 from utils.base.general import get_day_value
 
+# Weekday names and their three letter abbreviations, e.g. mon, wed
+RECURRING_DAY_NAMES = {
+    **WEEKDAYS,
+    **{name[:3]: value for name, value in WEEKDAYS.items()},
+}
+
+
+def parse_recurring_days(value: str) -> Tuple[int, ...]:
+    """
+    Parse a recurring value into sorted weekday numbers.
+    Value can be `everyday`, a weekday like `friday` or a comma
+    separated list of weekdays or abbreviations like `mon,wed,fri`
+
+    :raises ValueError: if a day name is not valid
+    """
+    value = value.strip().lower()
+    if value == settings.EVERYDAY:
+        return tuple(range(WEEKDAYS_COUNT))
+
+    days = set()
+    for name in value.split(','):
+        name = name.strip()
+        if name not in RECURRING_DAY_NAMES:
+            raise ValueError(f"Invalid recurring day {name!r}")
+        days.add(RECURRING_DAY_NAMES[name])
+    return tuple(sorted(days))
+
+
+def get_weekday_offset(begin: datetime.date, weekday: int) -> int:
+    """Amount of days from `begin` to the nearest `weekday`"""
+    return (weekday - begin.weekday()) % WEEKDAYS_COUNT
+
 
 def get_next_day_date(begin: datetime.date, day: str):
     """Get's the nearest weekday `day`
     for the nearest `begin`"""
-    for _ in range(7):
-        if begin.weekday() != get_day_value(day):
-            begin += DAY
-        else:
-            break
-    return begin
+    offset = get_weekday_offset(begin, get_day_value(day.lower()))
+    return begin + datetime.timedelta(days=offset)
 
 
 def generate_next_everydays(begin: datetime.date, count: int):
@@ -38,14 +69,49 @@ def generate_next_weekdays(start_date: datetime.date, count: int):
         count -= WEEKDAYS_COUNT
 
 
+@lru_cache(maxsize=1024)
+def get_recurring_dates(
+    begin: datetime.date, recurring_value: str, n_days: int
+) -> Tuple[datetime.date, ...]:
+    """
+    Compute the sorted leave dates of a recurring value from `begin`.
+
+    `everyday` gives the next n_days days, every weekday in other
+    values gives its nearest date from begin and the same weekday
+    of the following n_days // 7 weeks. Results are cached, so
+    plans sharing a start date and recurring value compute them once
+    """
+    if recurring_value.strip().lower() == settings.EVERYDAY:
+        return tuple(
+            begin + datetime.timedelta(days=day) for day in range(n_days))
+
+    weeks = n_days // WEEKDAYS_COUNT + 1
+    dates = []
+    for weekday in parse_recurring_days(recurring_value):
+        first = begin + datetime.timedelta(
+            days=get_weekday_offset(begin, weekday))
+        dates += [
+            first + datetime.timedelta(weeks=week) for week in range(weeks)]
+    return tuple(sorted(dates))
+
+
+def get_many_recurring_dates(
+    items: Iterable[Tuple[datetime.date, str]]
+) -> List[Tuple[datetime.date, ...]]:
+    """
+    Get the leave dates of many (begin, recurring_value) pairs
+    for the next `max_trip_plan_days`, in the same order
+    """
+    n_days: int = settings.MAX_TRIP_PLANS_DAYS
+    return [
+        get_recurring_dates(begin, recurring_value, n_days)
+        for begin, recurring_value in items]
+
+
 def generate_next_n_days(begin: datetime.date, recurring_value: str):
     """
     Generate the next dates depending on the recurring_value
     and max_trip_plan_days
     """
     n_days: int = settings.MAX_TRIP_PLANS_DAYS
-    if recurring_value == settings.EVERYDAY:
-        return generate_next_everydays(begin, n_days)
-    else:
-        start_date = get_next_day_date(begin, recurring_value)
-        return generate_next_weekdays(start_date, n_days)
+    return iter(get_recurring_dates(begin, recurring_value, n_days))
@@ -1,11 +1,12 @@
 from datetime import date
-from django.conf import settings
 
 from rest_framework.serializers import ValidationError
 from django.utils.translation import gettext_lazy as _
 
 from utils.base.general import today
 
+from .utils.base import parse_recurring_days
+
 
 class ErrCode:
     old_date = 'old_date'
@@ -16,23 +17,18 @@ class ErrCode:
 
 
 def validate_recurring_data(value: str):
+    """
+    Recurring value must be `everyday`, a weekday or comma separated
+    weekdays, full or abbreviated, e.g. `friday` or `mon,wed,fri`
+    """
     if value:
-        if value == settings.EVERYDAY:
-            return
-
-        # Means contains other days
-        list_of_valid_days = [
-            'monday', 'tuesday',
-            'wednesday', 'thursday',
-            'friday', 'saturday', 'sunday']
-
-        if value.lower() in list_of_valid_days:
-            return
-
-        raise ValidationError(
-            detail=_('Must provide a option for recurring days'),
-            code=ErrCode.invalid_day
-        )
+        try:
+            parse_recurring_days(value)
+        except ValueError:
+            raise ValidationError(
+                detail=_('Must provide a option for recurring days'),
+                code=ErrCode.invalid_day
+            )
 
 
 def validate_start_date(date: date):
@@ -26,6 +26,7 @@ INSTALLED_APPS = [
     'rest_framework',
     "corsheaders",
     'drf_yasg',
+    'django_crontab',
 
     # neccesary for postgres full text search
     'django.contrib.postgres',
@@ -35,11 +36,11 @@ INSTALLED_APPS = [
     'payment',
     'cargo',
     'transport',
+    'locations',
     "debug_toolbar",
 
     # new apps
     # 'testimonials',
-    # 'locations',
     # 'newsletter',
     # 'logistics',
 ]
@@ -263,6 +264,17 @@ MAX_IMAGE_UPLOAD_SIZE = 2621440  # 2.5MB
 MAX_TRIP_PLANS_DAYS = 30
 EVERYDAY = 'everyday'
 SEARCH_TRIPS_CACHE_TIME_IN_SECONDS = 180
+# Serve trip searches from the flattened TripAvailability table
+SEARCH_TRIPS_FROM_AVAILABILITY = False
+ROLL_TRIP_WINDOWS_BATCH_SIZE = 200
+ROLL_TRIP_WINDOWS_LOCK_TIME_IN_SECONDS = 3600
+
+
+# Scheduled jobs, install with `python manage.py crontab add`
+CRONJOBS = [
+    # Keep recurring trip plans filled with trips, daily at midnight
+    ('0 0 * * *', 'transport.cron.roll_trip_windows'),
+]
 
 
 LOGIN_URL = 'admin:login'
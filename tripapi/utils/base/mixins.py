@@ -2,10 +2,14 @@
 Mixins to be used across all packages
 """
 
-from typing import Callable, List
+from typing import Callable, List, Type
 
+from django.apps import apps
 from django.contrib import admin
+from django.contrib.postgres.search import SearchVector
 from django.db import models
+from django.db.models import Value
+from django.db.models.expressions import Combinable
 from django.db.models.query import QuerySet
 from rest_framework import mixins, viewsets
 from rest_framework.response import Response
@@ -102,6 +106,188 @@ class ModelChangeFunc(models.Model):
             setattr(self, clone_field, default_value)
 
 
+def get_search_vectors(fields: dict, values: dict = None) -> dict:
+    """
+    Build the update values for stored search vector columns.
+
+    :param fields: mapping of text field name to its vector field name
+    :type fields: dict
+    :param values: new values of the text fields, when passed the vectors
+    are built from them instead of the stored columns, defaults to None
+    :type values: dict, optional
+    :return: vector field names and their SearchVector expressions
+    :rtype: dict
+    """
+    vectors = {}
+    for field, vector_field in fields.items():
+        if values is None:
+            vectors[vector_field] = SearchVector(field)
+        elif field in values:
+            value = values[field]
+            if not isinstance(value, Combinable):
+                value = Value(value)
+            vectors[vector_field] = SearchVector(value)
+    return vectors
+
+
+class SearchVectorQuerySet(QuerySet):
+    """
+    Queryset that keeps stored search vector columns of a
+    SearchVectorMixin model in sync on bulk writes
+    """
+
+    @property
+    def search_vector_fields(self) -> dict:
+        return self.model.search_vector_fields or {}
+
+    def update_search_vectors(self) -> int:
+        """Rebuild the search vectors of rows in queryset from
+        their text columns in a single UPDATE"""
+        vectors = get_search_vectors(self.search_vector_fields)
+        if not vectors:
+            return 0
+        return super().update(**vectors)
+
+    def update(self, **kwargs):
+        kwargs.update(get_search_vectors(self.search_vector_fields, kwargs))
+        return super().update(**kwargs)
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        pks = [obj.pk for obj in objs if obj.pk is not None]
+        if pks:
+            self.model._base_manager.filter(pk__in=pks)\
+                .update(**get_search_vectors(self.search_vector_fields))
+        return objs
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        rows = super().bulk_update(objs, fields, *args, **kwargs)
+        if set(fields) & set(self.search_vector_fields):
+            self.model._base_manager.filter(pk__in=[obj.pk for obj in objs])\
+                .update(**get_search_vectors(self.search_vector_fields))
+        return rows
+
+
+class SearchVectorMixin(models.Model):
+    """
+    Stores precomputed search vectors of text fields so full text
+    search can use a GIN index instead of building vectors per query.
+
+    `search_vector_fields` maps a text field name to the
+    SearchVectorField it is indexed in.
+    """
+
+    class Meta:
+        abstract = True
+
+    search_vector_fields: dict = None
+
+    def update_search_vectors(self, fields=None):
+        """Rebuild this instance search vectors in the database"""
+        search_fields = self.search_vector_fields or {}
+        if fields is not None:
+            search_fields = {
+                key: value for key, value in search_fields.items()
+                if key in fields}
+        if search_fields:
+            self.__class__._base_manager.filter(pk=self.pk)\
+                .update(**get_search_vectors(search_fields))
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self.update_search_vectors(kwargs.get('update_fields'))
+
+
+def get_location_model() -> Type[models.Model]:
+    return apps.get_model('locations', 'Location')
+
+
+class ResolvedLocationQuerySet(QuerySet):
+    """
+    Queryset that resolves free text location fields of a
+    ResolvedLocationMixin model to registry locations on update
+    """
+
+    def update(self, **kwargs):
+        fields = self.model.location_fields or {}
+        texts = {
+            field: kwargs[field] for field, location_field in fields.items()
+            if isinstance(kwargs.get(field), str) and
+            location_field not in kwargs and
+            f'{location_field}_id' not in kwargs}
+        if texts:
+            resolved = get_location_model().objects\
+                .resolve_many(texts.values())
+            for field, text in texts.items():
+                kwargs[f'{fields[field]}_id'] = resolved[text]
+        return super().update(**kwargs)
+
+
+class ResolvedLocationMixin(models.Model):
+    """
+    Resolves free text location fields to registry locations once on
+    save, when they are new or changed, so searches can match ids.
+
+    `location_fields` maps a text field name to the
+    Location foreign key it is resolved to.
+    """
+
+    class Meta:
+        abstract = True
+
+    location_fields: dict = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance.set_loaded_locations()
+        return instance
+
+    def set_loaded_locations(self):
+        """Remember location texts as they are in the database"""
+        self._loaded_locations = {
+            field: self.__dict__[field]
+            for field in self.location_fields or {}
+            if field in self.__dict__}
+
+    def get_unresolved_location_fields(self) -> List[str]:
+        """Location texts that are new or changed since loaded"""
+        loaded = getattr(self, '_loaded_locations', {})
+        fields = []
+        for field, location_field in (self.location_fields or {}).items():
+            if field not in self.__dict__:
+                continue
+            if field in loaded:
+                changed = loaded[field] != self.__dict__[field]
+            else:
+                changed = getattr(self, f'{location_field}_id') is None
+            if changed:
+                fields.append(field)
+        return fields
+
+    def resolve_locations(self, fields: List[str] = None):
+        """Resolve location texts of fields in one query"""
+        if fields is None:
+            fields = list(self.location_fields or {})
+        texts = {field: getattr(self, field) for field in fields}
+        resolved = get_location_model().objects.resolve_many(texts.values())
+        for field, text in texts.items():
+            setattr(self, f'{self.location_fields[field]}_id', resolved[text])
+
+    def save(self, *args, **kwargs):
+        fields = self.get_unresolved_location_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            fields = [field for field in fields if field in update_fields]
+            kwargs['update_fields'] = {
+                *update_fields,
+                *(self.location_fields[field] for field in fields)}
+        if fields:
+            self.resolve_locations(fields)
+        super().save(*args, **kwargs)
+        self.set_loaded_locations()
+
+
 class UpdateRetrieveViewSet(
     mixins.UpdateModelMixin,
     mixins.RetrieveModelMixin,
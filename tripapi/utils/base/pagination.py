@@ -1,7 +1,157 @@
-from rest_framework.pagination import PageNumberPagination
+import datetime
+import json
+from base64 import b64decode, b64encode
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class CustomPagination(PageNumberPagination):
     page_size = 10
     page_size_query_param = 'page_size'
     max_page_size = 12
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination on stable sort keys. Pages are read with a WHERE
+    on the sort keys of the last row instead of an OFFSET, and total
+    count is only run when requested with `?count=true`.
+
+    Views set `cursor_ordering` to non null fields to sort on,
+    e.g ('-created',), the primary key is added as a tie breaker.
+    """
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 12
+    ordering = ('-created',)
+    count_query_param = 'count'
+
+    def get_ordering(self, request, queryset, view) -> Tuple[str, ...]:
+        ordering = tuple(getattr(view, 'cursor_ordering', self.ordering))
+        if ordering[-1].lstrip('-') != 'pk':
+            pk = '-pk' if ordering[-1].startswith('-') else 'pk'
+            ordering += (pk,)
+        return ordering
+
+    def get_fields(self) -> List[Tuple[str, bool]]:
+        """Sort fields and if they are descending"""
+        return [
+            (field.lstrip('-'), field.startswith('-'))
+            for field in self.ordering]
+
+    def encode_value(self, value):
+        if isinstance(value, (datetime.date, datetime.time)):
+            return value.isoformat()
+        return value
+
+    def encode_cursor(self, row, reverse: bool) -> str:
+        values = [
+            self.encode_value(getattr(row, field))
+            for field, _ in self.get_fields()]
+        data = json.dumps({'v': values, 'r': reverse})
+        encoded = b64encode(data.encode('ascii')).decode('ascii')
+        return replace_query_param(
+            self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request) -> Optional[Tuple[list, bool]]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            data = json.loads(b64decode(encoded.encode('ascii')))
+            values, reverse = data['v'], bool(data['r'])
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if not isinstance(values, list) or \
+                len(values) != len(self.get_fields()):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def get_keyset_q(self, values: list, reverse: bool) -> Q:
+        """Rows after the cursor values in the page direction"""
+        keyset, equal = Q(), Q()
+        for (field, descending), value in zip(self.get_fields(), values):
+            lookup = 'lt' if descending != reverse else 'gt'
+            keyset |= equal & Q(**{f'{field}__{lookup}': value})
+            equal &= Q(**{field: value})
+        return keyset
+
+    def get_include_count(self, request) -> bool:
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    def paginate_queryset(self, queryset: QuerySet, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.count = None
+        if self.get_include_count(request):
+            self.count = queryset.count()
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor[1]
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [
+                field[1:] if field.startswith('-') else f'-{field}'
+                for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        if cursor is not None:
+            queryset = queryset.filter(self.get_keyset_q(*cursor))
+
+        # One extra row tells if there is another page
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        return self.page
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], True)
+
+    def get_paginated_response(self, data):
+        response = OrderedDict()
+        if self.count is not None:
+            response['count'] = self.count
+        response['next'] = self.get_next_link()
+        response['previous'] = self.get_previous_link()
+        response['results'] = data
+        return Response(response)
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties'] = {
+            'count': {
+                'type': 'integer',
+                'example': 123,
+            },
+            **schema['properties'],
+        }
+        return schema